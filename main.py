@@ -2,19 +2,31 @@
 
 import os
 import argparse
+import json
+import logging
 import time
 from dataclasses import dataclass, field
+from collections.abc import Awaitable, Callable
+from typing import Any, TypeVar
 
 import asyncio
 
+import httpx
 import logfire
-from pydantic import BaseModel, Field
-from pydantic_ai import Agent, RunContext
-from pydantic_ai.models.openai import OpenAIChatModelSettings
+from pydantic import BaseModel, Field, TypeAdapter
+from pydantic_ai import Agent
+from pydantic_ai.models import Model
+from pydantic_ai.models.google import GoogleModel
+from pydantic_ai.models.openai import OpenAIChatModel, OpenAIChatModelSettings
+from pydantic_ai.providers.google import GoogleProvider
+from pydantic_ai.providers.openai import OpenAIProvider
+from pydantic_ai.usage import RunUsage
 from pydantic_ai.common_tools.duckduckgo import duckduckgo_search_tool
 from dotenv import load_dotenv
 
+from utils.batch import BatchRequest, BatchRunner
 from utils.log import log
+from utils.response_cache import ResponseCache
 from utils.template_manager import TemplateManager
 
 _ = load_dotenv()
@@ -28,20 +40,31 @@ if os.getenv("LOGFIRE_TOKEN"):
     _ = logfire.instrument_pydantic_ai()
 
 
-def resolve_model_string(model_name: str) -> str:
-    """Convert a model name to a pydantic-ai model string."""
+# Every agent call goes through the same connection pool, so the parallel
+# panel calls reuse warm keep-alive connections instead of new TLS handshakes.
+HTTP_LIMITS = httpx.Limits(max_connections=200, max_keepalive_connections=100)
+HTTP_TIMEOUT = httpx.Timeout(120.0, connect=5.0)
+
+# Top hypothesis probability at which the panel commits without testing.
+CERTAINTY_THRESHOLD = 0.95
+
+
+def build_model(model_name: str, http_client: httpx.AsyncClient) -> Model:
+    """Build a pydantic-ai model for `model_name` backed by `http_client`."""
     if model_name.startswith("gemini"):
-        return f"google-gla:{model_name}"
-    return f"openai:{model_name}"
+        return GoogleModel(model_name, provider=GoogleProvider(http_client=http_client))
+    return OpenAIChatModel(model_name, provider=OpenAIProvider(http_client=http_client))
 
 
 @dataclass
 class Dependencies:
-    """Shared dependencies injected into all agents."""
+    """Shared dependencies for every step of the panel."""
 
-    model: str
+    model: Model
     model_settings: OpenAIChatModelSettings | None
     template_manager: TemplateManager = field(repr=False)
+    hypothesis_samples: int = 1
+    response_cache: ResponseCache | None = field(default=None, repr=False)
 
 
 # --------------------------------------------------------------------------
@@ -119,160 +142,284 @@ class FinalDecision(BaseModel):
 
 
 # --------------------------------------------------------------------------
-# 3. Define the Orchestrator Agent and its Tools
+# 3. Define the Panel Agents
 # --------------------------------------------------------------------------
 
-orchestrator_agent = Agent(
-    output_type=FinalDecision,
-    deps_type=Dependencies,
-    instructions="""\
-You are the orchestrator of a virtual medical panel. Your goal is to determine the most likely diagnosis or the next best action for a patient.
-
-Follow this exact process:
-1.  **Hypothesize**: Use the `hypothesize` tool to generate initial diagnoses.
-2.  **Check Certainty**: If the top hypothesis probability is >= 95%, formulate a `FinalDecision` to commit to it and you are done.
-3.  **Propose Tests**: If certainty is < 95%, use the `request_tests` tool to propose tests.
-4.  **Debate**: Use the `debate` tool to gather critiques of the current plan.
-5.  **Synthesize**: **You must call the `reach_consensus` tool.** Pass all the information gathered so far (patient info, hypotheses, tests, and debate results) to it. This tool will provide the final, synthesized action.
-6.  **Finalize**: Package the action from `reach_consensus` into the `FinalDecision` object, adding a brief summary. Your job is to orchestrate, not to decide the final action yourself.
-""",
+# The panel agents are built once at import time; the model and its settings
+# are supplied per run from `Dependencies`. The agents that search the web
+# share one tool, and with it one DDGS client.
+web_search_tool = duckduckgo_search_tool()
+
+hypothesis_agent = Agent(
+    name="hypothesis",
+    output_type=list[Diagnosis],
+    tools=[web_search_tool],
+)
+test_chooser_agent = Agent(name="test_chooser", output_type=list[TestRequest])
+challenger_agent = Agent(name="challenger", output_type=ChallengerCritique)
+stewardship_agent = Agent(
+    name="stewardship",
+    output_type=list[StewardshipAdvice],
+    tools=[web_search_tool],
 )
+checklist_agent = Agent(name="checklist", output_type=list[QualityCheck])
+consensus_agent = Agent(name="consensus", output_type=FinalDecision)
+
+# Used to serialize each panel's output with a single call.
+stewardship_advice_adapter = TypeAdapter(list[StewardshipAdvice])
+quality_checks_adapter = TypeAdapter(list[QualityCheck])
+
+
+OutputT = TypeVar("OutputT")
+
+
+async def run_agent(
+    agent: Agent[None, OutputT],
+    prompt: str,
+    deps: Dependencies,
+    usage: RunUsage | None = None,
+    model_settings: OpenAIChatModelSettings | None = None,
+    sample: int = 0,
+) -> OutputT:
+    """
+    Runs a panel agent, reusing a cached response when one is available.
+
+    Args:
+        agent: The panel agent to run.
+        prompt: The rendered prompt.
+        deps: The shared dependencies, including the optional response cache.
+        usage: The usage tracker shared across the panel.
+        model_settings: Overrides `deps.model_settings` for this call.
+        sample: Distinguishes repeated samples of the same prompt in the cache.
+
+    Returns:
+        The agent's validated output.
+    """
+
+    settings = model_settings or deps.model_settings
+
+    async def run() -> OutputT:
+        result = await agent.run(
+            prompt, model=deps.model, model_settings=settings, usage=usage
+        )
+        return result.output
+
+    return await run_cached(agent, prompt, deps, run, settings, sample=sample)
+
+
+async def run_cached(
+    agent: Agent[None, OutputT],
+    prompt: str,
+    deps: Dependencies,
+    run: Callable[[], Awaitable[OutputT]],
+    model_settings: OpenAIChatModelSettings | None,
+    sample: int = 0,
+) -> OutputT:
+    """
+    Returns the cached output of an agent call, or awaits `run` and caches it.
+
+    Args:
+        agent: The panel agent being called.
+        prompt: The rendered prompt.
+        deps: The shared dependencies, including the optional response cache.
+        run: Runs the agent on `prompt` and returns its output.
+        model_settings: The settings `run` uses, which are part of the cache key.
+        sample: Distinguishes repeated samples of the same prompt in the cache.
+
+    Returns:
+        The agent's validated output.
+    """
+    cache = deps.response_cache
+    if cache is None:
+        return await run()
+    key = ResponseCache.key(
+        deps.model.model_name,
+        agent.name or "",
+        agent.output_type,
+        prompt,
+        model_settings=model_settings,
+        sample=sample,
+    )
+    cached = cache.get(key, agent.output_type)
+    if cached is not None:
+        log.info("Reusing the cached %s response.", agent.name)
+        return cached
+    output = await run()
+    cache.set(key, agent.output_type, output)
+    return output
+
+
+def merge_hypotheses(samples: list[list[Diagnosis]], top_k: int = 3) -> list[Diagnosis]:
+    """
+    Merges several differential diagnoses by self-consistency voting.
+
+    Conditions are matched case-insensitively. Each condition's probability is
+    averaged over all samples, counting zero where a sample omits it, and the
+    reasoning from its most confident sample is kept.
+    """
+    if len(samples) == 1:
+        return samples[0]
+    totals: dict[str, float] = {}
+    best: dict[str, Diagnosis] = {}
+    for sample in samples:
+        for h in sample:
+            key = " ".join(h.condition.lower().split())
+            totals[key] = totals.get(key, 0.0) + h.probability
+            if key not in best or h.probability > best[key].probability:
+                best[key] = h
+    merged = [
+        best[key].model_copy(update={"probability": min(1.0, total / len(samples))})
+        for key, total in totals.items()
+    ]
+    merged.sort(key=lambda h: h.probability, reverse=True)
+    return merged[:top_k]
+
+
+def commit_if_certain(hypotheses: list[Diagnosis]) -> FinalDecision | None:
+    """Commits to the top hypothesis if it clears `CERTAINTY_THRESHOLD`."""
+    top = max(hypotheses, key=lambda h: h.probability, default=None)
+    if top is None or top.probability < CERTAINTY_THRESHOLD:
+        return None
+    return FinalDecision(
+        action=top,
+        consensus_summary=f"Dr. Hypothesis is {top.probability:.0%} certain of {top.condition}; no further testing is needed.",
+    )
+
+
+# --------------------------------------------------------------------------
+# 4. Define the Panel Steps
+# --------------------------------------------------------------------------
 
 
-@orchestrator_agent.tool
 async def hypothesize(
-    ctx: RunContext[Dependencies], patient_info: str
+    deps: Dependencies, patient_info: str, usage: RunUsage | None = None
 ) -> list[Diagnosis]:
     """Generates a ranked list of the top 3 potential diagnoses."""
-    deps = ctx.deps
     prompt = deps.template_manager.render(
         "dr_hypothesis.jinja2", patient_info=patient_info
     )
-    log.info("Tool: Running Dr. Hypothesis...")
-    hypothesis_agent = Agent(
-        deps.model,
-        output_type=list[Diagnosis],
-        model_settings=deps.model_settings,
-        tools=[duckduckgo_search_tool()],
-    )
-    result = await hypothesis_agent.run(prompt, usage=ctx.usage)
+    # The samples are drawn at the model's default temperature, which already
+    # varies them enough for the vote to be useful.
+    samples = max(1, deps.hypothesis_samples)
+    log.info("Running Dr. Hypothesis (%d samples)...", samples)
+    results = await asyncio.gather(
+        *(
+            run_agent(
+                hypothesis_agent,
+                prompt,
+                deps,
+                usage=usage,
+                sample=i,
+            )
+            for i in range(samples)
+        )
+    )
+    hypotheses = merge_hypotheses(list(results))
     log.info(
-        f"Dr. Hypothesis's Differential Diagnosis: {[h.condition for h in result.output]}"
+        "Dr. Hypothesis's Differential Diagnosis: %s",
+        [h.condition for h in hypotheses],
     )
-    return result.output
+    return hypotheses
 
 
-@orchestrator_agent.tool
 async def request_tests(
-    ctx: RunContext[Dependencies], patient_info: str, hypotheses: list[Diagnosis]
+    deps: Dependencies,
+    patient_info: str,
+    hypotheses: list[Diagnosis],
+    usage: RunUsage | None = None,
 ) -> list[TestRequest]:
     """Proposes up to 3 diagnostic tests to differentiate between the top hypotheses."""
-    deps = ctx.deps
     prompt = deps.template_manager.render(
         "dr_test_chooser.jinja2", hypotheses=hypotheses, patient_info=patient_info
     )
-    log.info("Tool: Running Dr. Test Chooser...")
-    test_chooser_agent = Agent(
-        deps.model,
-        output_type=list[TestRequest],
-        model_settings=deps.model_settings,
-    )
-    result = await test_chooser_agent.run(prompt, usage=ctx.usage)
-    log.info(f"Dr. Test Chooser recommends: {[t.test_name for t in result.output]}")
-    return result.output
+    log.info("Running Dr. Test Chooser...")
+    tests = await run_agent(test_chooser_agent, prompt, deps, usage=usage)
+    log.info("Dr. Test Chooser recommends: %s", [t.test_name for t in tests])
+    return tests
+
+
+async def challenge(
+    deps: Dependencies, hypotheses: list[Diagnosis], usage: RunUsage | None = None
+) -> ChallengerCritique:
+    """Plays devil's advocate against the current hypotheses."""
+    prompt = deps.template_manager.render("dr_challenger.jinja2", hypotheses=hypotheses)
+    log.info("Running Dr. Challenger...")
+    critique = await run_agent(challenger_agent, prompt, deps, usage=usage)
+    log.info("Dr. Challenger found bias: %s", critique.identified_bias)
+    if log.isEnabledFor(logging.INFO):
+        log.info("Dr. Challenger's critique:\n%s", critique.model_dump_json(indent=2))
+    return critique
 
 
-@orchestrator_agent.tool
 async def debate(
-    ctx: RunContext[Dependencies],
+    deps: Dependencies,
     hypotheses: list[Diagnosis],
     test_requests: list[TestRequest],
+    challenger_critique: ChallengerCritique,
+    usage: RunUsage | None = None,
 ) -> DebateResults:
     """Runs the deliberation panel to critique the current plan."""
-    deps = ctx.deps
-    log.info("Tool: Convening the debate panel...")
+    log.info("Convening the debate panel...")
 
-    challenger_agent = Agent(
-        deps.model,
-        output_type=ChallengerCritique,
-        model_settings=deps.model_settings,
-    )
-    stewardship_agent = Agent(
-        deps.model,
-        output_type=list[StewardshipAdvice],
-        model_settings=deps.model_settings,
-        tools=[duckduckgo_search_tool()],
-    )
-    checklist_agent = Agent(
-        deps.model,
-        output_type=list[QualityCheck],
-        model_settings=deps.model_settings,
-    )
-
-    challenger_result, stewardship_result, checklist_result = await asyncio.gather(
-        challenger_agent.run(
-            deps.template_manager.render(
-                "dr_challenger.jinja2",
-                hypotheses=hypotheses,
-                test_requests=test_requests,
-            ),
-            usage=ctx.usage,
-        ),
-        stewardship_agent.run(
+    advice, checks = await asyncio.gather(
+        run_agent(
+            stewardship_agent,
             deps.template_manager.render(
                 "dr_stewardship.jinja2", test_requests=test_requests
             ),
-            usage=ctx.usage,
+            deps,
+            usage=usage,
         ),
-        checklist_agent.run(
+        run_agent(
+            checklist_agent,
             deps.template_manager.render(
                 "dr_checklist.jinja2",
                 hypotheses=hypotheses,
                 test_requests=test_requests,
             ),
-            usage=ctx.usage,
+            deps,
+            usage=usage,
         ),
     )
 
-    critique = challenger_result.output
-    advice = stewardship_result.output
-    checks = checklist_result.output
-
-    log.info(f"Dr. Challenger found bias: {critique.identified_bias}")
-    log.info(f"Dr. Challenger's critique:\n{critique.model_dump_json(indent=2)}")
-    log.info(
-        f"Dr. Stewardship approved {sum(1 for a in advice if a.is_approved)}/{len(advice)} tests."
-    )
-    log.info(
-        "Dr. Stewardship's advice:\n"
-        + "\n".join(a.model_dump_json(indent=2) for a in advice)
-    )
-    log.info(
-        f"Dr. Checklist passed {sum(1 for c in checks if c.is_consistent)}/{len(checks)} checks."
-    )
-    log.info(
-        "Dr. Checklist's checks:\n"
-        + "\n".join(c.model_dump_json(indent=2) for c in checks)
-    )
+    # Skip serializing the panel's output when nobody will read it.
+    if log.isEnabledFor(logging.INFO):
+        log.info(
+            "Dr. Stewardship approved %d/%d tests.",
+            sum(1 for a in advice if a.is_approved),
+            len(advice),
+        )
+        log.info(
+            "Dr. Stewardship's advice:\n%s",
+            stewardship_advice_adapter.dump_json(advice, indent=2).decode(),
+        )
+        log.info(
+            "Dr. Checklist passed %d/%d checks.",
+            sum(1 for c in checks if c.is_consistent),
+            len(checks),
+        )
+        log.info(
+            "Dr. Checklist's checks:\n%s",
+            quality_checks_adapter.dump_json(checks, indent=2).decode(),
+        )
 
     return DebateResults(
-        challenger_critique=critique,
+        challenger_critique=challenger_critique,
         stewardship_advice=advice,
         quality_checks=checks,
     )
 
 
-@orchestrator_agent.tool
 async def reach_consensus(
-    ctx: RunContext[Dependencies],
+    deps: Dependencies,
     patient_info: str,
     hypotheses: list[Diagnosis],
     test_requests: list[TestRequest],
     debate_results: DebateResults,
-) -> Diagnosis | TestRequest:
+    usage: RunUsage | None = None,
+) -> FinalDecision:
     """Synthesizes all information using the decision-maker prompt to select the single best action."""
-    deps = ctx.deps
-    log.info("Tool: Running Consensus Panel to make final decision...")
+    log.info("Running Consensus Panel to make final decision...")
 
     prompt = deps.template_manager.render(
         "dr_decision_maker.jinja2",
@@ -283,23 +430,218 @@ async def reach_consensus(
         stewardship_advice=debate_results.stewardship_advice,
         quality_checks=debate_results.quality_checks,
     )
-    consensus_agent = Agent(
-        deps.model,
-        output_type=Diagnosis | TestRequest,
-        model_settings=deps.model_settings,
-    )
-    result = await consensus_agent.run(prompt, usage=ctx.usage)
-    log.info(f"Consensus panel decided on action: {type(result.output).__name__}")
-    return result.output
+
+    async def run() -> FinalDecision:
+        # Stream the decision so the chosen action is reported as soon as it is
+        # complete, while the consensus summary is still being generated.
+        announced = False
+        async with consensus_agent.run_stream(
+            prompt,
+            model=deps.model,
+            model_settings=deps.model_settings,
+            usage=usage,
+        ) as result:
+            async for partial in result.stream_output():
+                if not announced:
+                    log.info(
+                        "Consensus panel decided on action: %s",
+                        type(partial.action).__name__,
+                    )
+                    announced = True
+            decision = await result.get_output()
+        if not announced:
+            log.info(
+                "Consensus panel decided on action: %s", type(decision.action).__name__
+            )
+        return decision
+
+    return await run_cached(consensus_agent, prompt, deps, run, deps.model_settings)
 
 
 # --------------------------------------------------------------------------
-# 4. Main Execution Block
+# 5. Define the Orchestrator
 # --------------------------------------------------------------------------
 
 
+async def diagnose(patient_info: str, deps: Dependencies) -> FinalDecision:
+    """
+    Runs the diagnostic panel on a single patient case.
+
+    The panel's steps always form the same DAG, so they are sequenced here in
+    plain Python rather than by an orchestrating LLM:
+    hypothesize -> (certain? done) -> request tests + challenge -> debate ->
+    consensus.
+    """
+    log.info("Patient Info: %s", patient_info)
+    usage = RunUsage()
+    hypotheses = await hypothesize(deps, patient_info, usage=usage)
+    decision = commit_if_certain(hypotheses)
+    if decision is not None:
+        log.info("Top hypothesis is certain enough; skipping the debate panel.")
+        return decision
+
+    test_requests, critique = await asyncio.gather(
+        request_tests(deps, patient_info, hypotheses, usage=usage),
+        challenge(deps, hypotheses, usage=usage),
+    )
+    debate_results = await debate(
+        deps, hypotheses, test_requests, critique, usage=usage
+    )
+    return await reach_consensus(
+        deps, patient_info, hypotheses, test_requests, debate_results, usage=usage
+    )
+
+
+async def diagnose_batch(
+    cases: list[str], deps: Dependencies
+) -> list[FinalDecision | None]:
+    """
+    Runs the panel over all cases through the OpenAI Batch API.
+
+    The panel's stages depend on each other, so each stage is submitted as one
+    batch covering every case that is still undecided. Batch requests cannot
+    call tools, so the panel runs without web search in this mode. A case
+    whose request fails in any stage is dropped from the later stages and
+    reported at the end, leaving `None` in its place.
+    """
+    if not isinstance(deps.model, OpenAIChatModel):
+        raise ValueError("Batch mode is only supported for OpenAI models.")
+    effort = (deps.model_settings or {}).get("openai_reasoning_effort")
+    runner = BatchRunner(
+        deps.model.client,
+        deps.model.model_name,
+        extra_body={"reasoning_effort": effort} if effort else None,
+    )
+    tm = deps.template_manager
+    decisions: dict[int, FinalDecision] = {}
+    failures: dict[int, str] = {}
+    pending = list(range(len(cases)))
+
+    async def run_stage(requests: list[BatchRequest]) -> dict[str, Any]:
+        """Runs one stage and drops the cases with a failed request from `pending`."""
+        result = await runner.run(requests)
+        for custom_id, reason in result.failed.items():
+            _ = failures.setdefault(
+                int(custom_id.split(":")[0]), f"{custom_id}: {reason}"
+            )
+        pending[:] = [i for i in pending if i not in failures]
+        return result.outputs
+
+    log.info("Batch: Running Dr. Hypothesis...")
+    hypotheses = await run_stage(
+        [
+            BatchRequest(
+                f"{i}:hypothesis",
+                tm.render("dr_hypothesis.jinja2", patient_info=cases[i]),
+                list[Diagnosis],
+            )
+            for i in pending
+        ]
+    )
+    for i in list(pending):
+        decision = commit_if_certain(hypotheses[f"{i}:hypothesis"])
+        if decision is not None:
+            decisions[i] = decision
+            pending.remove(i)
+
+    log.info("Batch: Running Dr. Test Chooser and Dr. Challenger...")
+    plans = await run_stage(
+        [
+            BatchRequest(
+                f"{i}:test_chooser",
+                tm.render(
+                    "dr_test_chooser.jinja2",
+                    hypotheses=hypotheses[f"{i}:hypothesis"],
+                    patient_info=cases[i],
+                ),
+                list[TestRequest],
+            )
+            for i in pending
+        ]
+        + [
+            BatchRequest(
+                f"{i}:challenger",
+                tm.render(
+                    "dr_challenger.jinja2", hypotheses=hypotheses[f"{i}:hypothesis"]
+                ),
+                ChallengerCritique,
+            )
+            for i in pending
+        ]
+    )
+
+    log.info("Batch: Running Dr. Stewardship and Dr. Checklist...")
+    reviews = await run_stage(
+        [
+            BatchRequest(
+                f"{i}:stewardship",
+                tm.render(
+                    "dr_stewardship.jinja2", test_requests=plans[f"{i}:test_chooser"]
+                ),
+                list[StewardshipAdvice],
+            )
+            for i in pending
+        ]
+        + [
+            BatchRequest(
+                f"{i}:checklist",
+                tm.render(
+                    "dr_checklist.jinja2",
+                    hypotheses=hypotheses[f"{i}:hypothesis"],
+                    test_requests=plans[f"{i}:test_chooser"],
+                ),
+                list[QualityCheck],
+            )
+            for i in pending
+        ]
+    )
+
+    log.info("Batch: Running Consensus Panel...")
+    consensus = await run_stage(
+        [
+            BatchRequest(
+                f"{i}:consensus",
+                tm.render(
+                    "dr_decision_maker.jinja2",
+                    patient_info=cases[i],
+                    hypotheses=hypotheses[f"{i}:hypothesis"],
+                    test_requests=plans[f"{i}:test_chooser"],
+                    challenger_critique=plans[f"{i}:challenger"],
+                    stewardship_advice=reviews[f"{i}:stewardship"],
+                    quality_checks=reviews[f"{i}:checklist"],
+                ),
+                FinalDecision,
+            )
+            for i in pending
+        ]
+    )
+    for i in pending:
+        decisions[i] = consensus[f"{i}:consensus"]
+
+    for i, reason in sorted(failures.items()):
+        log.error("Batch: Case %d failed (%s).", i, reason)
+    return [decisions.get(i) for i in range(len(cases))]
+
+
+# --------------------------------------------------------------------------
+# 6. Main Execution Block
+# --------------------------------------------------------------------------
+
+
+def load_cases(path: str) -> list[str]:
+    """Reads patient cases from a JSONL file of `{"patient_info": ...}` objects."""
+    with open(path, encoding="utf-8") as f:
+        return [str(json.loads(line)["patient_info"]) for line in f if line.strip()]
+
+
+def log_decision(index: int, decision: FinalDecision) -> None:
+    """Logs the panel's final decision for the case at `index`."""
+    if log.isEnabledFor(logging.INFO):
+        log.info("Case %d decision:\n%s", index, decision.model_dump_json(indent=2))
+
+
 async def main() -> None:
-    """Runs a single pass of the diagnostic orchestrator."""
+    """Runs the diagnostic orchestrator on one or more patient cases."""
     parser = argparse.ArgumentParser(description="Run the diagnostic orchestrator.")
     _ = parser.add_argument(
         "--patient-info",
@@ -307,6 +649,35 @@ async def main() -> None:
         default="A 65-year-old male presents with a 3-day history of high fever, a productive cough, and shortness of breath.",
         help="The patient case information.",
     )
+    _ = parser.add_argument(
+        "--patient-info-file",
+        type=str,
+        default=None,
+        help='A JSONL file with one {"patient_info": ...} case per line. Overrides --patient-info.',
+    )
+    _ = parser.add_argument(
+        "--max-concurrency",
+        type=int,
+        default=None,
+        help="The maximum number of cases diagnosed concurrently. Default is 4.",
+    )
+    _ = parser.add_argument(
+        "--hypothesis-samples",
+        type=int,
+        default=None,
+        help="Parallel Dr. Hypothesis samples merged by self-consistency voting. Each sample is a separate call, with its own web searches. Default is 3.",
+    )
+    _ = parser.add_argument(
+        "--cache-dir",
+        type=str,
+        default=None,
+        help="Cache agent responses on disk in this directory and reuse them for identical prompts.",
+    )
+    _ = parser.add_argument(
+        "--batch",
+        action="store_true",
+        help="Run every case through the OpenAI Batch API (cheaper, slower, no web search).",
+    )
     _ = parser.add_argument(
         "--model",
         type=str,
@@ -316,35 +687,97 @@ async def main() -> None:
     args = parser.parse_args()
 
     model_name = str(args.model)
-    patient_info = str(args.patient_info)
+    if args.batch and model_name.startswith("gemini"):
+        parser.error("--batch is only supported for OpenAI models.")
+    if args.batch:
+        # The batch path draws one hypothesis per case, submits every case at
+        # once and does not use the response cache.
+        for flag, value in (
+            ("--max-concurrency", args.max_concurrency),
+            ("--hypothesis-samples", args.hypothesis_samples),
+            ("--cache-dir", args.cache_dir),
+        ):
+            if value is not None:
+                parser.error(f"{flag} is not supported with --batch.")
+    # These default to None so that batch mode can tell whether they were set.
+    max_concurrency = 4 if args.max_concurrency is None else int(args.max_concurrency)
+    hypothesis_samples = (
+        3 if args.hypothesis_samples is None else int(args.hypothesis_samples)
+    )
+    cases = (
+        load_cases(args.patient_info_file)
+        if args.patient_info_file
+        else [str(args.patient_info)]
+    )
 
-    model_string = resolve_model_string(model_name)
     model_settings = (
         OpenAIChatModelSettings(openai_reasoning_effort="low")
         if "gpt-5" in model_name
         else None
     )
-    deps = Dependencies(
-        model=model_string,
-        model_settings=model_settings,
-        template_manager=TemplateManager("templates"),
-    )
 
-    log.info("--- Starting Diagnostic Process ---")
-    log.info(f"Patient Info: {patient_info}")
-    log.info(f"Model: {model_string}")
-
-    start_time = time.time()
-    result = await orchestrator_agent.run(
-        patient_info,
-        deps=deps,
-        model=deps.model,
-        model_settings=deps.model_settings,
-    )
+    async with httpx.AsyncClient(
+        limits=HTTP_LIMITS, timeout=HTTP_TIMEOUT
+    ) as http_client:
+        # A single `Dependencies` is shared by every case, so the model,
+        # connection pool and template cache are set up once per process.
+        deps = Dependencies(
+            model=build_model(model_name, http_client),
+            model_settings=model_settings,
+            template_manager=TemplateManager("templates"),
+            hypothesis_samples=hypothesis_samples,
+            response_cache=ResponseCache(args.cache_dir) if args.cache_dir else None,
+        )
+
+        log.info("--- Starting Diagnostic Process ---")
+        log.info("Cases: %d", len(cases))
+        log.info("Model: %s:%s", deps.model.system, deps.model.model_name)
+
+        semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+        async def run_case(index: int, patient_info: str) -> FinalDecision | None:
+            # A failing case is logged and skipped so it does not abort the
+            # rest of the run.
+            async with semaphore:
+                try:
+                    decision = await diagnose(patient_info, deps)
+                except Exception:
+                    log.exception("Case %d failed.", index)
+                    return None
+            log_decision(index, decision)
+            return decision
+
+        start_time = time.time()
+        try:
+            if args.batch:
+                decisions = await diagnose_batch(cases, deps)
+                for i, decision in enumerate(decisions):
+                    if decision is not None:
+                        log_decision(i, decision)
+            else:
+                decisions = await asyncio.gather(
+                    *(run_case(i, case) for i, case in enumerate(cases))
+                )
+        finally:
+            if deps.response_cache is not None:
+                deps.response_cache.close()
     total_duration = time.time() - start_time
-    log.info(f"--- Orchestrator Conclusion (Total time: {total_duration:.2f}s) ---")
-    log.info(result.output.model_dump_json(indent=2))
+    failed = [i for i, decision in enumerate(decisions) if decision is None]
+    log.info(
+        "--- Orchestrator Conclusion (Total time: %.2fs, %d/%d cases decided) ---",
+        total_duration,
+        len(decisions) - len(failed),
+        len(decisions),
+    )
+    if failed:
+        log.error("Failed cases: %s", failed)
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    # uvloop is a faster drop-in event loop, but it is not available everywhere.
+    try:
+        import uvloop
+    except ImportError:
+        asyncio.run(main())
+    else:
+        uvloop.run(main())
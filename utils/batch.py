@@ -0,0 +1,184 @@
+"""OpenAI Batch API utilities."""
+
+import asyncio
+import json
+from dataclasses import dataclass
+from functools import cache
+from typing import Any
+
+from openai import AsyncOpenAI
+
+from utils.log import log
+from utils.schema import compact_json_schema, type_adapter
+
+_TERMINAL_STATUSES = {"completed", "failed", "expired", "cancelled"}
+
+
+@dataclass
+class BatchRequest:
+    """A single structured-output prompt to submit as part of a batch."""
+
+    custom_id: str
+    prompt: str
+    output_type: Any
+
+
+@dataclass
+class BatchResult:
+    """The outcome of a batch: validated outputs and the reasons for failures."""
+
+    outputs: dict[str, Any]
+    failed: dict[str, str]
+
+
+@cache
+def _response_format(name: str, output_type: Any) -> dict[str, Any]:
+    """
+    Builds a JSON-schema `response_format` for `output_type`.
+
+    The schema is wrapped in a `response` property because the API requires an
+    object at the top level, while several panel outputs are lists or unions.
+    The result is cached, since every case in a stage shares the same schema.
+    """
+    schema = type_adapter(output_type).json_schema()
+    defs = schema.pop("$defs", None)
+    wrapper: dict[str, Any] = {
+        "type": "object",
+        "properties": {"response": schema},
+        "required": ["response"],
+    }
+    if defs:
+        wrapper["$defs"] = defs
+    return {
+        "type": "json_schema",
+        "json_schema": {"name": name, "schema": compact_json_schema(wrapper)},
+    }
+
+
+def _failure_reason(item: dict[str, Any]) -> str:
+    """Describes why the batch output line `item` failed."""
+    error = item.get("error")
+    response = item.get("response") or {}
+    if not error:
+        error = (response.get("body") or {}).get("error")
+    if isinstance(error, dict):
+        error = error.get("message") or error.get("code")
+    status = response.get("status_code")
+    return f"HTTP {status}: {error}" if status else str(error)
+
+
+class BatchRunner:
+    """Runs groups of prompts through the OpenAI Batch API."""
+
+    def __init__(
+        self,
+        client: AsyncOpenAI,
+        model_name: str,
+        extra_body: dict[str, Any] | None = None,
+        poll_interval: float = 30.0,
+    ) -> None:
+        """
+        Initializes the batch runner.
+
+        Args:
+            client: The OpenAI client used to upload files and manage batches.
+            model_name: The chat completions model every request is sent to.
+            extra_body: Extra fields merged into every request body.
+            poll_interval: Seconds to wait between batch status checks.
+        """
+        self.client: AsyncOpenAI = client
+        self.model_name: str = model_name
+        self.extra_body: dict[str, Any] = extra_body or {}
+        self.poll_interval: float = poll_interval
+
+    async def run(self, requests: list[BatchRequest]) -> BatchResult:
+        """
+        Submits `requests` as one batch and waits for it to finish.
+
+        A request that errors, is refused or returns an invalid output does not
+        fail the batch; it is reported in `BatchResult.failed` instead.
+
+        Args:
+            requests: The prompts to run, each with a unique `custom_id`.
+
+        Returns:
+            The validated outputs and failure reasons, keyed by `custom_id`.
+        """
+        if not requests:
+            return BatchResult(outputs={}, failed={})
+
+        by_id = {r.custom_id: r for r in requests}
+        lines = [
+            json.dumps(
+                {
+                    "custom_id": r.custom_id,
+                    "method": "POST",
+                    "url": "/v1/chat/completions",
+                    "body": {
+                        "model": self.model_name,
+                        "messages": [{"role": "user", "content": r.prompt}],
+                        "response_format": _response_format(
+                            r.custom_id.split(":")[-1], r.output_type
+                        ),
+                        **self.extra_body,
+                    },
+                }
+            )
+            for r in requests
+        ]
+        input_file = await self.client.files.create(
+            file=("batch.jsonl", "\n".join(lines).encode()), purpose="batch"
+        )
+        batch = await self.client.batches.create(
+            input_file_id=input_file.id,
+            endpoint="/v1/chat/completions",
+            completion_window="24h",
+        )
+        log.info("Batch: Submitted %s with %d requests...", batch.id, len(requests))
+
+        while batch.status not in _TERMINAL_STATUSES:
+            await asyncio.sleep(self.poll_interval)
+            batch = await self.client.batches.retrieve(batch.id)
+        log.info("Batch: %s finished with status '%s'.", batch.id, batch.status)
+        if batch.status == "failed" and batch.errors is not None:
+            for error in batch.errors.data or []:
+                log.error(
+                    "Batch: %s failed: %s (%s)", batch.id, error.message, error.code
+                )
+
+        outputs: dict[str, Any] = {}
+        failed: dict[str, str] = {}
+        # Successful requests are written to the output file and failed ones to
+        # the error file. Expired or cancelled batches may have either.
+        lines: list[str] = []
+        for file_id in (batch.output_file_id, batch.error_file_id):
+            if file_id is not None:
+                content = await self.client.files.content(file_id)
+                lines.extend(content.text.splitlines())
+        for line in lines:
+            if not line.strip():
+                continue
+            item = json.loads(line)
+            custom_id = item["custom_id"]
+            response = item.get("response") or {}
+            if item.get("error") or response.get("status_code") != 200:
+                failed[custom_id] = _failure_reason(item)
+                continue
+            message = response["body"]["choices"][0]["message"]
+            if message.get("content") is None:
+                failed[custom_id] = f"refused: {message.get('refusal')}"
+                continue
+            request = by_id[custom_id]
+            try:
+                outputs[custom_id] = type_adapter(request.output_type).validate_python(
+                    json.loads(message["content"])["response"]
+                )
+            except (ValueError, KeyError, TypeError) as e:
+                failed[custom_id] = f"invalid output: {e}"
+
+        for custom_id in by_id:
+            if custom_id not in outputs and custom_id not in failed:
+                failed[custom_id] = f"no response (batch {batch.status})"
+        if failed:
+            log.warning("Batch: %s had %d failed requests.", batch.id, len(failed))
+        return BatchResult(outputs=outputs, failed=failed)
@@ -1,7 +1,10 @@
 """Logging configuration."""
 
+import atexit
 import logging
+import logging.handlers
 import os
+import queue
 import sys
 
 
@@ -10,7 +13,10 @@ def get_logger(name: str) -> logging.Logger:
     Configures and returns a logger instance.
 
     The log level is determined by the `LOG_LEVEL` environment variable.
-    If not set, it defaults to `INFO`.
+    If not set, it defaults to `INFO`. Records are still formatted on the
+    calling thread, including their arguments and tracebacks, but the write to
+    stdout happens on a background listener thread, so a slow stdout does not
+    stall the event loop.
     """
     log_level_str = os.getenv("LOG_LEVEL", "INFO").upper()
     log_level = getattr(logging, log_level_str, logging.INFO)
@@ -25,10 +31,18 @@ def get_logger(name: str) -> logging.Logger:
     handler.setLevel(log_level)
     handler.setFormatter(formatter)
 
+    # Hand records to the stream handler through a queue and a listener thread
+    log_queue: queue.SimpleQueue[logging.LogRecord] = queue.SimpleQueue()
+    listener = logging.handlers.QueueListener(
+        log_queue, handler, respect_handler_level=True
+    )
+    listener.start()
+    _ = atexit.register(listener.stop)
+
     # Get logger and add handler
     logger = logging.getLogger(name)
     logger.setLevel(log_level)
-    logger.addHandler(handler)
+    logger.addHandler(logging.handlers.QueueHandler(log_queue))
     logger.propagate = False  # Prevents duplicating logs to the root logger
 
     return logger
@@ -0,0 +1,107 @@
+"""On-disk cache of agent responses."""
+
+import hashlib
+import json
+from collections.abc import Mapping
+from functools import cache
+from pathlib import Path
+from typing import Any
+
+import diskcache
+from pydantic import ValidationError
+
+from utils.log import log
+from utils.schema import type_adapter
+
+
+@cache
+def _schema_digest(output_type: Any) -> str:
+    """Returns a (cached) SHA-256 digest of the JSON schema of `output_type`."""
+    schema = json.dumps(type_adapter(output_type).json_schema(), sort_keys=True)
+    return hashlib.sha256(schema.encode()).hexdigest()
+
+
+class ResponseCache:
+    """Stores validated agent outputs keyed by model, agent, output type and prompt."""
+
+    def __init__(self, directory: str | Path) -> None:
+        """
+        Opens (or creates) the cache.
+
+        Args:
+            directory: The directory holding the cache database.
+        """
+        self._cache: diskcache.Cache = diskcache.Cache(str(directory))
+
+    @staticmethod
+    def key(
+        model_name: str,
+        agent_name: str,
+        output_type: Any,
+        prompt: str,
+        model_settings: Mapping[str, Any] | None = None,
+        sample: int = 0,
+    ) -> str:
+        """
+        Builds the cache key for a single agent call.
+
+        Args:
+            model_name: The name of the model answering the prompt.
+            agent_name: The name of the agent.
+            output_type: The agent's output type. Its schema is part of the
+                key, so changing a data model invalidates its cached outputs.
+            prompt: The rendered prompt.
+            model_settings: The effective model settings, such as temperature.
+            sample: Distinguishes repeated samples of the same prompt.
+
+        Returns:
+            A SHA-256 hex digest identifying the call.
+        """
+        settings = json.dumps(dict(model_settings or {}), sort_keys=True, default=str)
+        payload = "\0".join(
+            (
+                model_name,
+                agent_name,
+                _schema_digest(output_type),
+                settings,
+                str(sample),
+                prompt,
+            )
+        )
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def get(self, key: str, output_type: Any) -> Any | None:
+        """
+        Looks up a cached output.
+
+        Args:
+            key: The key returned by `ResponseCache.key`.
+            output_type: The type to validate the cached output against.
+
+        Returns:
+            The cached output, or `None` on a miss. An entry that no longer
+            validates against `output_type` is treated as a miss.
+        """
+        raw = self._cache.get(key)
+        if raw is None:
+            return None
+        try:
+            return type_adapter(output_type).validate_json(raw)
+        except ValidationError as e:
+            log.warning("Ignoring a stale cache entry %s: %s", key, e)
+            return None
+
+    def set(self, key: str, output_type: Any, output: Any) -> None:
+        """
+        Stores an output.
+
+        Args:
+            key: The key returned by `ResponseCache.key`.
+            output_type: The type of `output`, used to serialize it.
+            output: The validated agent output.
+        """
+        _ = self._cache.set(key, type_adapter(output_type).dump_json(output))
+
+    def close(self) -> None:
+        """Closes the underlying cache database."""
+        self._cache.close()
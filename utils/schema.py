@@ -0,0 +1,50 @@
+"""JSON schema and validation utilities."""
+
+from functools import cache
+from typing import Any
+
+from pydantic import TypeAdapter
+
+# Keys whose values map arbitrary names to subschemas, so a key called
+# "title" inside them is a name rather than a schema annotation.
+_NAMED_SUBSCHEMAS = {"properties", "$defs", "definitions", "patternProperties"}
+
+
+@cache
+def type_adapter(output_type: Any) -> TypeAdapter[Any]:
+    """Returns the (cached) `TypeAdapter` for `output_type`."""
+    return TypeAdapter(output_type)
+
+
+def _strip_titles(node: Any) -> Any:
+    """Recursively removes `title` annotations from a schema node."""
+    if isinstance(node, list):
+        return [_strip_titles(item) for item in node]
+    if not isinstance(node, dict):
+        return node
+    return {
+        key: (
+            {name: _strip_titles(sub) for name, sub in value.items()}
+            if key in _NAMED_SUBSCHEMAS and isinstance(value, dict)
+            else _strip_titles(value)
+        )
+        for key, value in node.items()
+        if key != "title"
+    }
+
+
+def compact_json_schema(schema: dict[str, Any]) -> dict[str, Any]:
+    """
+    Shrinks a JSON schema before it is sent to a model.
+
+    Pydantic adds a `title` to every model and field, which only repeats the
+    names the schema already has, so these are removed. Descriptions are
+    kept, since the model relies on them.
+
+    Args:
+        schema: The schema to compact. It is not modified.
+
+    Returns:
+        The compacted schema.
+    """
+    return _strip_titles(schema)
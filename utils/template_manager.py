@@ -1,7 +1,12 @@
 """Template management utilities."""
 
+from collections import OrderedDict
 from pathlib import Path
-from jinja2 import Environment, FileSystemLoader
+from jinja2 import Environment, FileSystemLoader, Template
+from pydantic_core import PydanticSerializationError, to_json
+
+# Maximum number of rendered prompts kept per TemplateManager.
+RENDER_CACHE_SIZE = 64
 
 
 class TemplateManager:
@@ -11,17 +16,33 @@ class TemplateManager:
         """
         Initializes the Jinja2 environment.
 
+        Templates are not expected to change while the process is running, so
+        auto-reloading is disabled and every `*.jinja2` file in the folder is
+        compiled up front, keeping file I/O out of the render path.
+
         Args:
             template_folder: The path to the directory containing template files.
         """
         self.jinja_env: Environment = Environment(
-            loader=FileSystemLoader(template_folder), autoescape=True
+            loader=FileSystemLoader(template_folder),
+            autoescape=True,
+            auto_reload=False,
+            cache_size=400,
         )
+        self._tpl_cache: dict[str, Template] = {
+            path.name: self.jinja_env.get_template(path.name)
+            for path in sorted(Path(template_folder).glob("*.jinja2"))
+        }
+        self._render_cache: OrderedDict[tuple[str, bytes], str] = OrderedDict()
 
     def render(self, template_name: str, **context: object) -> str:
         """
         Renders a template with the given context.
 
+        Templates are pure functions of their context, so renders are cached
+        in a small LRU keyed by the template name and the JSON-serialized
+        context. Contexts that cannot be serialized are rendered uncached.
+
         Args:
             template_name: The filename of the template to render.
             **context: Keyword arguments to pass to the template.
@@ -29,5 +50,27 @@ class TemplateManager:
         Returns:
             The rendered template as a string.
         """
-        template = self.jinja_env.get_template(template_name)
-        return template.render(**context)
+        try:
+            key = (template_name, to_json(sorted(context.items())))
+        except PydanticSerializationError:
+            return self._get_template(template_name).render(**context)
+
+        rendered = self._render_cache.get(key)
+        if rendered is not None:
+            self._render_cache.move_to_end(key)
+            return rendered
+
+        rendered = self._get_template(template_name).render(**context)
+        self._render_cache[key] = rendered
+        if len(self._render_cache) > RENDER_CACHE_SIZE:
+            _ = self._render_cache.popitem(last=False)
+        return rendered
+
+    def _get_template(self, template_name: str) -> Template:
+        """Returns the compiled template, loading it on first use."""
+        template = self._tpl_cache.get(template_name)
+        if template is None:
+            template = self._tpl_cache.setdefault(
+                template_name, self.jinja_env.get_template(template_name)
+            )
+        return template